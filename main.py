@@ -2,8 +2,52 @@ import sys
 import secrets
 import hmac
 import hashlib
-from typing import List, Tuple
-import prettytable
+from typing import List, Optional, Tuple
+import numpy as np
+
+# Encoded HMAC messages for the coin toss (0..1) and dice throw (0..5) values
+_SMALL_INT_BYTES = tuple(str(i).encode() for i in range(6))
+
+# Valid numeric answers for the coin toss and the dice throw prompts
+_COIN_CHOICES = frozenset((0, 1))
+_DIE_CHOICES = frozenset(range(6))
+
+# Final result messages, indexed by sign(computer_score - user_score) + 1
+_RESULT_MESSAGES = (
+    "You win! ({c} < {u})",
+    "It's a tie ({u} = {c})",
+    "I win! ({c} > {u})",
+)
+
+# Longest numeric answer accepted; also keeps int() clear of its max-str-digits limit
+_MAX_CHOICE_DIGITS = 6
+
+def _parse_choice(text: str) -> Optional[int]:
+    # Plain digit check instead of int() in try/except, so bad input never raises
+    text = text.strip()
+    if len(text) <= _MAX_CHOICE_DIGITS and text.isascii() and text.isdigit():
+        return int(text)
+    return None
+
+# Fixed menus, written with a single call instead of one print per line
+_FIRST_MOVE_MENU = (
+    "Try to guess my selection.\n"
+    "0 - 0\n"
+    "1 - 1\n"
+    "X - exit\n"
+    "? - help\n"
+)
+_PLAY_TURN_MENU = (
+    "Add your number module 6\n"
+    "0 - 0\n"
+    "1 - 1\n"
+    "2 - 2\n"
+    "3 - 3\n"
+    "4 - 4\n"
+    "5 - 5\n"
+    "X - exit\n"
+    "? - help\n"
+)
 
 class DiceParser:
     @staticmethod
@@ -17,25 +61,150 @@ class DiceParser:
         try:
             dice_configs = []
             for arg in args:
-                dice = [int(x) for x in arg.split(',')]
-                if len(dice) != 6:
+                dice = np.array(arg.split(','), dtype=np.int64)
+                if dice.size != 6:
                     raise ValueError(f"Each dice must have exactly 6 faces. Invalid configuration: {arg}")
                 dice_configs.append(dice)
-            return dice_configs
-        except ValueError as e:
+            return np.vstack(dice_configs)
+        except (ValueError, OverflowError) as e:
             raise ValueError(f"Invalid dice configuration: {str(e)}\n"
                              "Ensure all arguments are comma-separated integers with exactly 6 values.")
 
 class FairRandomGenerator:
+    KEY_SIZE = 32
+
+    def __init__(self, batch_size: int = 4):
+        self.batch_size = batch_size
+        self._subkeys: List[Tuple[str, "hmac.HMAC"]] = []
+
+    def _refill_subkeys(self) -> None:
+        # One master seed is expanded into a batch of independent per-draw keys,
+        # each paired with an HMAC context that is already keyed for it; the keys
+        # are kept as the hex strings revealed to the user
+        master_seed = secrets.token_bytes(self.KEY_SIZE)
+        keystream = hashlib.shake_256(master_seed).digest(self.KEY_SIZE * self.batch_size)
+        subkeys = [keystream[i:i + self.KEY_SIZE] for i in range(0, len(keystream), self.KEY_SIZE)]
+        self._subkeys = [(key.hex(), hmac.new(key, b"", hashlib.sha256)) for key in subkeys]
+
     @staticmethod
-    def generate_fair_random(range_max: int) -> Tuple[int, str, bytes]:
-        secret_key = secrets.token_bytes(32)
+    def _random_below(bound: int) -> int:
+        # Coin tosses and dice throws only need a single byte of entropy
+        if bound == 2:
+            return secrets.token_bytes(1)[0] & 1
+        if bound == 6:
+            while True:
+                byte = secrets.token_bytes(1)[0]
+                if byte < 252:  # Largest multiple of 6 below 256 keeps the result uniform
+                    return byte % 6
+        return secrets.randbelow(bound)
+
+    def generate_fair_random(self, range_max: int) -> Tuple[int, str, str]:
+        if not self._subkeys:
+            self._refill_subkeys()
+        secret_key_hex, hmac_obj = self._subkeys.pop(0)
         
-        random_value = secrets.randbelow(range_max + 1)
-        hmac_obj = hmac.new(secret_key, str(random_value).encode(), hashlib.sha3_256)
+        random_value = self._random_below(range_max + 1)
+        if random_value < len(_SMALL_INT_BYTES):
+            message = _SMALL_INT_BYTES[random_value]
+        else:
+            message = str(random_value).encode()
+        hmac_obj.update(message)
         hmac_hex = hmac_obj.hexdigest()
 
-        return random_value, hmac_hex, secret_key
+        return random_value, hmac_hex, secret_key_hex
+
+# Importing numba and loading the cached kernels costs about 0.5 s per process
+# (a first-ever compile about 2.5 s); the NumPy broadcast only gets that slow
+# at roughly 2000 dice, so smaller games never touch numba
+_NUMBA_MIN_DICE = 2000
+
+_numba_kernels = None
+
+def _load_numba_kernels():
+    """
+    Imports numba on first use and returns the (plain, SWAR) win-count kernels,
+    or None when numba is not installed.
+    """
+    global _numba_kernels
+    if _numba_kernels is not None:
+        return _numba_kernels or None
+    try:
+        import numba
+    except ImportError:
+        _numba_kernels = ()
+        return None
+
+    @numba.njit(parallel=True, cache=True)
+    def _win_matrix(arr, out):
+        n, faces = arr.shape
+        for i in numba.prange(n):
+            for j in range(n):
+                if i == j:
+                    continue
+                wins = 0
+                for k in range(faces):
+                    for l in range(faces):
+                        if arr[i, k] > arr[j, l]:
+                            wins += 1
+                out[i, j] = wins
+        return out
+
+    @numba.njit(parallel=True, cache=True)
+    def _win_matrix_swar(packed, faces, lane_ones, lane_highs, out):
+        # Each dice is packed as one byte per face; a byte lane of
+        # (x | 0x80) - (y + 1) keeps its high bit exactly when x > y
+        n = packed.shape[0]
+        for i in numba.prange(n):
+            for j in range(n):
+                if i == j:
+                    continue
+                rhs = packed[j] + lane_ones
+                wins = np.uint64(0)
+                for k in range(faces):
+                    face = (packed[i] >> np.uint64(8 * k)) & np.uint64(0xFF)
+                    mask = ((face * lane_ones) | lane_highs) - rhs
+                    mask = (mask & lane_highs) >> np.uint64(7)
+                    # Sum the per-lane 0/1 flags into the top byte
+                    wins += (mask * np.uint64(0x0101010101010101)) >> np.uint64(56)
+                out[i, j] = wins
+        return out
+
+    _numba_kernels = (_win_matrix, _win_matrix_swar)
+    return _numba_kernels
+
+def _win_count_dtype(faces: int) -> np.dtype:
+    # Smallest signed type that holds faces * faces, the most wins one pair can have
+    for dtype in (np.int16, np.int32):
+        if faces * faces <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+def _pack_faces(arr: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Packs every dice into a uint64 with one byte per face, shifted so the lowest face is 0.
+    Returns None when the faces do not fit the 7-bit lanes the SWAR kernel needs.
+    """
+    faces = arr.shape[1]
+    # Python ints, so a spread beyond int64 cannot wrap around into range
+    lowest = int(arr.min())
+    if faces > 8 or int(arr.max()) - lowest > 127:
+        return None
+    shifted = (arr - lowest).astype(np.uint64)
+    shifts = np.arange(faces, dtype=np.uint64) * np.uint64(8)
+    return np.bitwise_or.reduce(shifted << shifts, axis=1)
+
+def _swar_win_counts(arr: np.ndarray, out: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Fills out with win counts from the SWAR kernel for an int64 dice matrix.
+    Returns None when the faces cannot be packed or numba is not installed.
+    """
+    packed = _pack_faces(arr)
+    kernels = _load_numba_kernels()
+    if packed is None or kernels is None:
+        return None
+    faces = arr.shape[1]
+    lane_ones = np.uint64(int("01" * faces, 16))
+    return kernels[1](packed, faces, lane_ones, lane_ones * np.uint64(0x80), out)
 
 class ProbabilityCalculator:
     """
@@ -43,46 +212,78 @@ class ProbabilityCalculator:
     """
 
     @staticmethod
-    def calculate_win_probabilities(dice_configs: List[List[int]]) -> List[List[float]]:
-        def calculate_pair_probability(dice1: List[int], dice2: List[int]) -> float:
-            wins = sum(1 for x in dice1 for y in dice2 if x > y)
-            total = len(dice1) * len(dice2)
-            return round(wins / total, 4)
+    def calculate_win_counts(dice_configs: List[List[int]]) -> np.ndarray:
+        # Keep the caller's integer dtype, so Game's int8 matrix is compared as int8
+        arr = np.asarray(dice_configs)
+        kernels = _load_numba_kernels() if len(arr) >= _NUMBA_MIN_DICE else None
+        if kernels is not None:
+            # Streams the comparisons without building the n*n*36 temporary
+            arr = np.ascontiguousarray(arr, dtype=np.int64)
+            out = np.zeros((len(arr), len(arr)), dtype=_win_count_dtype(arr.shape[1]))
+            wins = _swar_win_counts(arr, out)
+            if wins is None:
+                wins = kernels[0](arr, out)
+            return wins
         
-        probabilities = []
-        for i in range(len(dice_configs)):
-            row = []
-            for j in range(len(dice_configs)):
-                if i == j:
-                    row.append(0.3333)  # Probability for self-match
-                else:
-                    row.append(calculate_pair_probability(
-                        dice_configs[i], dice_configs[j]
-                    ))
-            probabilities.append(row)
+        # wins[i, j] counts face pairs where dice i beats dice j, for all pairs at once.
+        # Self-match entries are left as computed; probabilities_from_win_counts replaces them.
+        wins = (arr[:, None, :, None] > arr[None, :, None, :]).sum(axis=(2, 3))
+        return wins.astype(_win_count_dtype(arr.shape[1]))
+
+    @staticmethod
+    def probabilities_from_win_counts(win_counts: np.ndarray, faces: int = 6) -> List[List[float]]:
+        probabilities = win_counts / (faces * faces)
+        np.fill_diagonal(probabilities, 0.3333)  # Probability for self-match
+        np.round(probabilities, 4, out=probabilities)
         
-        return probabilities
+        return probabilities.tolist()
+
+    @staticmethod
+    def calculate_win_probabilities(dice_configs: List[List[int]]) -> List[List[float]]:
+        win_counts = ProbabilityCalculator.calculate_win_counts(dice_configs)
+        faces = np.shape(dice_configs)[1]
+        return ProbabilityCalculator.probabilities_from_win_counts(win_counts, faces)
 
 class Game:
     def __init__(self, dice_configs):
-        self.dices = dice_configs
-        self.probability_matrix = ProbabilityCalculator.calculate_win_probabilities(dice_configs)
+        self.dices_arr = self._pack_dices(dice_configs)
+        self._alive = np.ones(len(self.dices_arr), dtype=bool)
+        # One draw each for the first move, the computer's dice and the two throws
+        self.random_generator = FairRandomGenerator(batch_size=4)
+        self._win_counts = ProbabilityCalculator.calculate_win_counts(self.dices_arr)
+        self.probability_matrix = ProbabilityCalculator.probabilities_from_win_counts(
+            self._win_counts, self.dices_arr.shape[1]
+        )
         self.computer_score = 0
         self.user_score = 0
-        self.computer_dice = None
-        self.user_dice = None
+        self._computer_dice_idx = None
+        self._user_dice_idx = None
         self.turn = None
+        self._help_text = None
+    
+    @staticmethod
+    def _pack_dices(dice_configs) -> np.ndarray:
+        # Store all dice in one contiguous int8 matrix unless a face does not fit
+        arr = np.asarray(dice_configs, dtype=np.int64)
+        info = np.iinfo(np.int8)
+        if arr.size and info.min <= arr.min() and arr.max() <= info.max:
+            return arr.astype(np.int8)
+        return arr
+    
+    def _alive_indices(self) -> np.ndarray:
+        # Chosen dice are only masked out, so no list entries are shifted
+        return np.flatnonzero(self._alive)
+    
+    def _take_dice(self, index: int) -> int:
+        self._alive[index] = False
+        return int(index)
     
     def determine_first_move(self) -> None:
-        computer_value, hmac_value, secret_key = FairRandomGenerator.generate_fair_random(1)
+        computer_value, hmac_value, secret_key = self.random_generator.generate_fair_random(1)
         
         print("Let's determine who makes the first move.")
         print(f"I selected a random value in the range 0..1 (HMAC={hmac_value}).")
-        print("Try to guess my selection.")
-        print("0 - 0")
-        print("1 - 1")
-        print("X - exit")
-        print("? - help")
+        sys.stdout.write(_FIRST_MOVE_MENU)
         
         while True:
             user_guess = input("Your selection: ")
@@ -92,32 +293,35 @@ class Game:
             elif user_guess == '?':
                 self.display_help()
                 continue
-            try:
-                user_guess = int(user_guess)
-                if user_guess not in [0, 1]:
-                    print("Please select 0 or 1.")
-                    continue
-                
-                print(f"My selection: {computer_value} (KEY={secret_key.hex()}).")
-                
-                if computer_value == user_guess:
-                  self.turn = "user"
-                else:
-                  self.turn = "computer"
-                break
-            except ValueError:
+            
+            user_guess = _parse_choice(user_guess)
+            if user_guess is None:
                 print("Invalid input. Please enter 0, 1, X, or ?")
+                continue
+            if user_guess not in _COIN_CHOICES:
+                print("Please select 0 or 1.")
+                continue
+            
+            print(f"My selection: {computer_value} (KEY={secret_key}).")
+            
+            if computer_value == user_guess:
+              self.turn = "user"
+            else:
+              self.turn = "computer"
+            break
     
     def select_dice(self) -> None:
         # Computer Selects dice first
         if self.turn == "computer":
-            computer_index = FairRandomGenerator.generate_fair_random(len(self.dices) - 1)[0]
-            self.computer_dice = self.dices.pop(computer_index)
-            print(f"I choose the {self.computer_dice} dice.")
+            alive = self._alive_indices()
+            computer_index = self.random_generator.generate_fair_random(len(alive) - 1)[0]
+            self._computer_dice_idx = self._take_dice(alive[computer_index])
+            print(f"I choose the {self.dices_arr[self._computer_dice_idx].tolist()} dice.")
             
             # Show remaining dice for user
+            alive = self._alive_indices()
             print("Choose your dice:")
-            for i, dice in enumerate(self.dices):
+            for i, dice in enumerate(self.dices_arr[alive].tolist()):
                 print(f"{i} - {dice}")
             print("X - exit")
             print("? - help")
@@ -131,20 +335,21 @@ class Game:
                     self.display_help()
                     continue
                 
-                try:
-                    user_index = int(user_input)
-                    if 0 <= user_index < len(self.dices):
-                        self.user_dice = self.dices[user_index]
-                        print(f"You choose the {self.user_dice} dice.")
-                        break
-                    print("Invalid dice selection.")
-                except ValueError:
+                user_index = _parse_choice(user_input)
+                if user_index is None:
                     print("Invalid input. Please enter a valid number, X, or ?")
+                    continue
+                if 0 <= user_index < len(alive):
+                    self._user_dice_idx = self._take_dice(alive[user_index])
+                    print(f"You choose the {self.dices_arr[self._user_dice_idx].tolist()} dice.")
+                    break
+                print("Invalid dice selection.")
         
         # User selects first dice
         else:
+            alive = self._alive_indices()
             print("Choose your dice:")
-            for i, dice in enumerate(self.dices):
+            for i, dice in enumerate(self.dices_arr[alive].tolist()):
                 print(f"{i} - {dice}")
             print("X - exit")
             print("? - help")
@@ -158,33 +363,26 @@ class Game:
                     self.display_help()
                     continue
                 
-                try:
-                    user_index = int(user_input)
-                    if 0 <= user_index < len(self.dices):
-                        self.user_dice = self.dices.pop(user_index)
-                        print(f"You choose the {self.user_dice} dice.")
-
-                        computer_index = FairRandomGenerator.generate_fair_random(len(self.dices) - 1)[0]
-                        self.computer_dice = self.dices.pop(computer_index)
-                        print(f"I choose the {self.computer_dice} dice.")
-                        break
-                    print("Invalid dice selection.")
-                except ValueError:
+                user_index = _parse_choice(user_input)
+                if user_index is None:
                     print("Invalid input. Please enter a valid number, X, or ?")
+                    continue
+                if 0 <= user_index < len(alive):
+                    self._user_dice_idx = self._take_dice(alive[user_index])
+                    print(f"You choose the {self.dices_arr[self._user_dice_idx].tolist()} dice.")
+
+                    alive = self._alive_indices()
+                    computer_index = self.random_generator.generate_fair_random(len(alive) - 1)[0]
+                    self._computer_dice_idx = self._take_dice(alive[computer_index])
+                    print(f"I choose the {self.dices_arr[self._computer_dice_idx].tolist()} dice.")
+                    break
+                print("Invalid dice selection.")
     
     def play_turn(self) -> None:
-        computer_value, computer_hmac, computer_key = FairRandomGenerator.generate_fair_random(5)
+        computer_value, computer_hmac, computer_key = self.random_generator.generate_fair_random(5)
         print("It's time to throw the dice.")
         print(f"I selected a random value in the range 0..5 (HMAC={computer_hmac}).")
-        print("Add your number module 6")
-        print("0 - 0")
-        print("1 - 1")
-        print("2 - 2")
-        print("3 - 3")
-        print("4 - 4")
-        print("5 - 5")
-        print("X - exit")
-        print("? - help")
+        sys.stdout.write(_PLAY_TURN_MENU)
         
         while True:
             user_input = input("Your selection: ")
@@ -195,50 +393,55 @@ class Game:
                 self.display_help()
                 continue
             
-            try:
-                user_value = int(user_input)
-                if user_value not in range(6):
-                    print("Please select a number between 0 and 5.")
-                    continue
-                
-                result = (computer_value + user_value) % 6
-                print(f"My number is {computer_value} (KEY={computer_key.hex()}).")
-                print(f"The result is {computer_value} + {user_value} = {result} (mod 6).")
-                
-                # Throw dice based on turn
-                if self.turn == "computer":
-                    print(f"My throw is {self.computer_dice[result]}")
-                    self.computer_score = self.computer_dice[result]
-                    self.turn = "user"
-                else:
-                    print(f"Your throw is {self.user_dice[result]}")
-                    self.user_score = self.user_dice[result]
-                    self.turn = "computer"
-                
-                break
-            except ValueError:
+            user_value = _parse_choice(user_input)
+            if user_value is None:
                 print("Invalid input. Please enter a number between 0 and 5, X, or ?")
+                continue
+            if user_value not in _DIE_CHOICES:
+                print("Please select a number between 0 and 5.")
+                continue
+            
+            result = (computer_value + user_value) % 6
+            print(f"My number is {computer_value} (KEY={computer_key}).")
+            print(f"The result is {computer_value} + {user_value} = {result} (mod 6).")
+            
+            # Throw dice based on turn
+            if self.turn == "computer":
+                self.computer_score = int(self.dices_arr[self._computer_dice_idx, result])
+                print(f"My throw is {self.computer_score}")
+                self.turn = "user"
+            else:
+                self.user_score = int(self.dices_arr[self._user_dice_idx, result])
+                print(f"Your throw is {self.user_score}")
+                self.turn = "computer"
+            
+            break
     
     def final_scores(self):
-        if self.computer_score > self.user_score:
-            print(f"I win! ({self.computer_score} > {self.user_score})")
-        elif self.user_score > self.computer_score:
-            print(f"You win! ({self.computer_score} < {self.user_score})")
-        else:
-            print(f"It's a tie ({self.user_score} = {self.computer_score})")
+        outcome = (self.computer_score > self.user_score) - (self.user_score > self.computer_score)
+        print(_RESULT_MESSAGES[outcome + 1].format(c=self.computer_score, u=self.user_score))
         
       
-    def display_help(self):
+    def _render_help_table(self) -> str:
+        # prettytable is only needed once help is requested, so keep it off the startup path
+        import prettytable
+        
         table = prettytable.PrettyTable()
-        table.field_names = ["User dice ▼"] + [f"{dice}" for dice in self.dices]
+        dices = self.dices_arr.tolist()
+        table.field_names = ["User dice ▼"] + [f"{dice}" for dice in dices]
         
-        for i, dice in enumerate(self.dices):
+        for i, dice in enumerate(dices):
             row = [f"{dice}"]
-            row.extend([f"- ({self.probability_matrix[i][j]})" if i == j else str(self.probability_matrix[i][j]) for j in range(len(self.dices))])
+            row.extend([f"- ({self.probability_matrix[i][j]})" if i == j else str(self.probability_matrix[i][j]) for j in range(len(dices))])
             table.add_row(row)
         
-        print("\nProbability of the win for the user:")
-        print(table)
+        return str(table)
+    
+    def display_help(self):
+        # The matrix never changes after __init__, so the table is rendered only once
+        if self._help_text is None:
+            self._help_text = self._render_help_table()
+        print("\nProbability of the win for the user:\n" + self._help_text)
 
 def main():
     try:
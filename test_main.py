@@ -0,0 +1,63 @@
+import importlib.util
+
+import numpy as np
+import pytest
+
+import main
+
+requires_numba = pytest.mark.skipif(importlib.util.find_spec("numba") is None, reason="numba not installed")
+
+
+def test_win_probabilities_with_extreme_faces():
+    dice = [[2**63 - 1] * 6, [-5] * 6, [0] * 6]
+    assert main.ProbabilityCalculator.calculate_win_probabilities(dice) == [
+        [0.3333, 1.0, 1.0],
+        [0.0, 0.3333, 0.0],
+        [0.0, 1.0, 0.3333],
+    ]
+
+
+def test_win_probabilities_with_many_faces():
+    # 200 * 200 face pairs no longer fit in int16 win counts
+    dice = [[10] * 200, [1] * 200, [1] * 200]
+    assert main.ProbabilityCalculator.calculate_win_probabilities(dice) == [
+        [0.3333, 1.0, 1.0],
+        [0.0, 0.3333, 0.0],
+        [0.0, 0.0, 0.3333],
+    ]
+
+
+@requires_numba
+def test_plain_kernel_with_many_faces(monkeypatch):
+    monkeypatch.setattr(main, "_NUMBA_MIN_DICE", 2)
+    dice = np.array([[10] * 200, [1] * 200, [1] * 200])
+    counts = main.ProbabilityCalculator.calculate_win_counts(dice)
+    assert counts[0, 1] == counts[0, 2] == 200 * 200
+
+
+@requires_numba
+@pytest.mark.parametrize("seed", range(20))
+def test_swar_kernel_matches_plain_kernel(seed):
+    rng = np.random.default_rng(seed)
+    faces = int(rng.integers(1, 9))
+    low = int(rng.integers(-1000, 1000))
+    arr = rng.integers(low, low + 128, size=(int(rng.integers(3, 40)), faces), dtype=np.int64)
+    win_matrix, _ = main._load_numba_kernels()
+    swar = main._swar_win_counts(arr, np.zeros((len(arr), len(arr)), dtype=np.int16))
+    np.testing.assert_array_equal(swar, win_matrix(arr, np.zeros_like(swar)))
+
+
+@requires_numba
+def test_pack_faces_rejects_spread_beyond_int64():
+    arr = np.array([[2**62] * 6, [-(2**62)] * 6, [0] * 6], dtype=np.int64)
+    assert main._pack_faces(arr) is None
+
+
+@requires_numba
+def test_wide_spread_falls_back_to_plain_kernel(monkeypatch):
+    monkeypatch.setattr(main, "_NUMBA_MIN_DICE", 2)
+    rng = np.random.default_rng(0)
+    arr = rng.choice(np.array([2**62, -(2**62), 0, 1]), size=(40, 6))
+    expected = (arr[:, None, :, None] > arr[None, :, None, :]).sum(axis=(2, 3))
+    np.fill_diagonal(expected, 0)
+    np.testing.assert_array_equal(main.ProbabilityCalculator.calculate_win_counts(arr), expected)